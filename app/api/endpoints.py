@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List
+from functools import lru_cache
 from ..services.pdf_service import PDFService
 from ..utils.logger import setup_logger
 
@@ -8,23 +9,10 @@ router = APIRouter()
 staging_logger = setup_logger("staging_endpoints", is_prod=False)
 prod_logger = setup_logger("prod_endpoints", is_prod=True)
 
-# Initialize services as None
-staging_service = None
-prod_service = None
 
-
-def get_staging_service():
-    global staging_service
-    if staging_service is None:
-        staging_service = PDFService(is_prod=False)
-    return staging_service
-
-
-def get_prod_service():
-    global prod_service
-    if prod_service is None:
-        prod_service = PDFService(is_prod=True)
-    return prod_service
+@lru_cache()
+def get_service(is_prod: bool) -> PDFService:
+    return PDFService(is_prod=is_prod)
 
 
 class MergeRequest(BaseModel):
@@ -71,8 +59,8 @@ async def merge_pdfs_staging(request: MergeRequest):
     staging_logger.info(
         f"Received staging merge request for lead_id: {request.lead_id}")
     try:
-        service = get_staging_service()
-        s3_key = service.process_and_merge(
+        service = get_service(False)
+        s3_key = await service.process_and_merge_async(
             request.urls, request.lead_id, is_prod=False)
         staging_logger.info(
             f"Successfully completed staging merge for lead_id: {request.lead_id}")
@@ -107,8 +95,8 @@ async def merge_pdfs_prod(request: MergeRequest):
     prod_logger.info(
         f"Received production merge request for lead_id: {request.lead_id}")
     try:
-        service = get_prod_service()
-        s3_key = service.process_and_merge(
+        service = get_service(True)
+        s3_key = await service.process_and_merge_async(
             request.urls, request.lead_id, is_prod=True)
         prod_logger.info(
             f"Successfully completed production merge for lead_id: {request.lead_id}")
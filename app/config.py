@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     STAGING_BUCKET_NAME: str
     PROD_BUCKET_NAME: str
 
+    # Also write each merged PDF to "<key>.alt" for consumers that fall
+    # back to it on a 404 (see "Alt Key Double-Write" in README.md)
+    S3_DOUBLE_WRITE: bool = False
+
+    # Merged PDFs kept in memory for repeated requests: total size limit
+    # in bytes (0 disables) and how long an entry may be reused
+    MERGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    MERGE_CACHE_TTL_SECONDS: int = 300
+
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
     STAGING_LOG_FILE: str = str(LOGS_DIR / "staging.log")
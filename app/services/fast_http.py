@@ -0,0 +1,48 @@
+import asyncio
+import os
+from typing import List, Tuple, Union
+
+import aiohttp
+from yarl import URL
+
+# Concurrent GETs past this point stop improving S3 throughput
+DEFAULT_CONCURRENCY = 16
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+DownloadResult = Union[Tuple[str, str], BaseException]
+
+
+async def download_all(urls: List[str], dest_dir: str, concurrency: int = DEFAULT_CONCURRENCY) -> List[DownloadResult]:
+    """
+    Download all URLs concurrently over a single shared session.
+
+    Bodies are streamed to files in dest_dir in DOWNLOAD_CHUNK_SIZE
+    pieces, so a request never holds a whole document in memory.
+
+    Args:
+        urls: List of URLs to download
+        dest_dir: Directory the downloaded files are written to
+        concurrency: Maximum number of in-flight requests
+
+    Returns:
+        One entry per URL, in the same order: either a
+        (content_type, file_path) tuple or the exception raised for that URL
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def fetch(i: int, url: str) -> Tuple[str, str]:
+            async with semaphore:
+                # encoded=True keeps presigned signatures from being re-quoted
+                async with session.get(URL(url, encoded=True)) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get(
+                        'content-type', '').lower()
+                    path = os.path.join(dest_dir, f'input_{i}')
+                    with open(path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    return content_type, path
+
+        return await asyncio.gather(*(fetch(i, url) for i, url in enumerate(urls, 1)), return_exceptions=True)
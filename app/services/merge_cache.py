@@ -0,0 +1,85 @@
+import time
+from calendar import timegm
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CacheKey = Tuple[str, ...]
+
+# Query parameters added by S3 presigning; everything else (e.g. versionId)
+# selects what is downloaded
+SIGNING_PARAM_PREFIX = 'x-amz-'
+
+
+def _signing_params_removed(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not name.lower().startswith(SIGNING_PARAM_PREFIX)]
+    return urlunsplit(parts._replace(query=urlencode(sorted(query)), fragment=''))
+
+
+def cache_key(lead_id: str, urls: List[str]) -> CacheKey:
+    """
+    Build a cache key from the lead and its URLs with presigning parameters removed.
+
+    Presigned URLs carry a fresh X-Amz-* signature every time they are
+    issued, so those parameters are dropped; the rest of the query is kept
+    because it can select a different object version. Order is kept
+    because it determines the page order of the merged document. The lead
+    is part of the key so one lead's merge is never served to another.
+    """
+    return (lead_id, *(_signing_params_removed(url) for url in urls))
+
+
+def presigned_url_valid(url: str, now: Optional[float] = None) -> bool:
+    """
+    Whether a URL is presigned and still inside its X-Amz-Date + X-Amz-Expires window.
+
+    Only such URLs prove the caller was granted access to the object, so
+    only they may be answered from the cache without going to S3.
+    """
+    params = {name.lower(): value for name, value in parse_qsl(urlsplit(url).query)}
+    if not all(name in params for name in ('x-amz-signature', 'x-amz-date', 'x-amz-expires')):
+        return False
+    try:
+        signed_at = timegm(time.strptime(params['x-amz-date'], '%Y%m%dT%H%M%SZ'))
+        expires_at = signed_at + int(params['x-amz-expires'])
+    except ValueError:
+        return False
+    return (time.time() if now is None else now) < expires_at
+
+
+class MergeCache:
+    """Least-recently-used cache of merged PDF bytes, bounded by total size and age"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: float = 300):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, merged = entry
+        if time.monotonic() - stored_at >= self.ttl_seconds:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return merged
+
+    def put(self, key: CacheKey, merged: bytes) -> None:
+        # Disabled, or a single document would evict everything else
+        if self.max_bytes <= 0 or self.ttl_seconds <= 0 or len(merged) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), merged)
+        self._size += len(merged)
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: CacheKey) -> None:
+        _, merged = self._entries.pop(key)
+        self._size -= len(merged)
@@ -1,320 +1,789 @@
+import aioboto3
 import boto3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import BytesIO
-from PyPDF2 import PdfReader
-from typing import List, Optional, Tuple
+from pypdf import PdfReader, PdfWriter, Transformation
+from pypdf.generic import RectangleObject
+from typing import BinaryIO, List, Literal, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import tempfile
 import os
+import shutil
+import subprocess
+from contextlib import ExitStack
 from datetime import datetime
 import logging
 import time
+import secrets
+from functools import lru_cache
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from ..config import get_settings
 from ..utils.logger import setup_logger
+from .fast_http import DOWNLOAD_CHUNK_SIZE, download_all
+from .merge_cache import MergeCache, cache_key, presigned_url_valid
 from PIL import Image
 
-
-class PDFService:
-    def __init__(self, is_prod: bool = False):
-        self.settings = get_settings()
-        self.is_prod = is_prod
-        self.logger = setup_logger("pdf_service", is_prod)
-
-        # Configure S3 client with retries and longer timeouts
-        config = Config(
-            retries=dict(
-                max_attempts=3,
-                mode='adaptive'
-            ),
-            connect_timeout=5,
-            read_timeout=10,
-            max_pool_connections=50
-        )
-
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=self.settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=self.settings.AWS_SECRET_ACCESS_KEY,
-            region_name=self.settings.AWS_REGION,
-            config=config
-        )
-        self.logger.info(
-            f"Initialized PDFService for {'production' if is_prod else 'staging'} environment")
-
-    def convert_image_to_pdf(self, image_data: BytesIO) -> Optional[BytesIO]:
-        """Convert image to PDF with A4 sizing"""
-        try:
-            # Open image
-            image = Image.open(image_data)
-
-            # Convert to RGB if necessary
-            if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                background.paste(image, mask=image.split()[-1])
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-
-            # A4 size in pixels at 300 DPI (standard print quality)
-            A4_WIDTH = 2480  # 8.27 inches * 300 DPI
-            A4_HEIGHT = 3508  # 11.69 inches * 300 DPI
-
-            # Calculate aspect ratio
-            img_width, img_height = image.size
-            aspect_ratio = img_width / img_height
-
-            # Calculate new dimensions while maintaining aspect ratio
-            if aspect_ratio > 1:  # Landscape
-                new_width = min(A4_WIDTH, img_width)
-                new_height = int(new_width / aspect_ratio)
-                if new_height > A4_HEIGHT:
-                    new_height = A4_HEIGHT
-                    new_width = int(new_height * aspect_ratio)
-            else:  # Portrait
-                new_height = min(A4_HEIGHT, img_height)
+# Files up to this size stay in memory; larger ones spill to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+FileKind = Literal['pdf', 'image', 'unknown']
+
+PDF_EXTENSIONS = {'pdf'}
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
+IMAGE_CONTENT_TYPES = ['image/jpeg', 'image/png', 'image/gif']
+
+
+def classify(url: str) -> FileKind:
+    """Classify a URL as a PDF or image from its path suffix, ignoring the query string"""
+    filename = urlparse(url).path.rsplit('/', 1)[-1]
+    if '.' not in filename:
+        return 'unknown'
+    extension = filename.rsplit('.', 1)[-1].lower()
+    if extension in PDF_EXTENSIONS:
+        return 'pdf'
+    if extension in IMAGE_EXTENSIONS:
+        return 'image'
+    return 'unknown'
+
+
+def classify_content_type(content_type: str) -> FileKind:
+    """Classify a response by its content type, for URLs without a known suffix"""
+    if 'application/pdf' in content_type:
+        return 'pdf'
+    if any(img_type in content_type for img_type in IMAGE_CONTENT_TYPES):
+        return 'image'
+    return 'unknown'
+
+
+# Shared HTTP session so repeated downloads from the same bucket host
+# reuse pooled keep-alive connections instead of a new TLS handshake each
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+)
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+
+# Upload merged PDFs over 8MB as concurrent multipart chunks; 16 threads
+# stay well inside the client's 50-connection pool
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+
+# With S3_DOUBLE_WRITE enabled, every merged PDF is also written to
+# "<key>.alt"; readers that get a 404 on the primary key retry the alt key
+ALT_KEY_SUFFIX = ".alt"
+
+
+def alt_key(key: str) -> str:
+    """Secondary S3 key written alongside the primary one when double-writing"""
+    return f"{key}{ALT_KEY_SUFFIX}"
+
+
+UPLOAD_MAX_RETRIES = 3
+UPLOAD_RETRY_DELAY = 2  # seconds
+
+
+def _upload_retry_delay(error: Exception, attempt: int, logger: logging.Logger) -> Optional[float]:
+    """
+    Log a failed upload attempt and decide whether to retry it.
+
+    Shared by the sync and async uploads so both classify errors and back
+    off the same way.
+
+    Returns:
+        Seconds to wait before the next attempt, or None to give up
+    """
+    if isinstance(error, ClientError):
+        error_code = error.response.get('Error', {}).get('Code')
+        error_message = error.response.get('Error', {}).get('Message')
+
+        if error_code == 'RequestTimeTooSkewed':
+            logger.warning(
+                "Time skew detected on attempt %d. Waiting before retry...", attempt + 1)
+            # Wait longer for time skew issues
+            delay = UPLOAD_RETRY_DELAY * (attempt + 1) * 2
+        else:
+            logger.error(
+                "S3 upload error (attempt %d/%d): %s - %s", attempt + 1, UPLOAD_MAX_RETRIES, error_code, error_message)
+            delay = UPLOAD_RETRY_DELAY * (attempt + 1)
+    else:
+        logger.error(
+            "Unexpected error during S3 upload (attempt %d/%d): %s", attempt + 1, UPLOAD_MAX_RETRIES, error)
+        delay = UPLOAD_RETRY_DELAY * (attempt + 1)
+
+    if attempt == UPLOAD_MAX_RETRIES - 1:
+        return None
+    return delay
+
+
+def _s3_client_config() -> Config:
+    """Configure S3 clients with retries and longer timeouts"""
+    return Config(
+        retries=dict(
+            max_attempts=3,
+            mode='adaptive'
+        ),
+        connect_timeout=5,
+        read_timeout=10,
+        max_pool_connections=50
+    )
+
+
+@lru_cache()
+def get_s3_client():
+    """Shared S3 client, so every PDFService reuses one connection pool"""
+    settings = get_settings()
+
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+        config=_s3_client_config()
+    )
+
+
+@lru_cache()
+def get_aio_session() -> aioboto3.Session:
+    """Shared aioboto3 session for uploads made from the event loop"""
+    settings = get_settings()
+
+    return aioboto3.Session(
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION
+    )
+
+
+A4_WIDTH_INCHES = 8.27
+A4_HEIGHT_INCHES = 11.69
+MIN_IMAGE_DPI = 72
+MAX_IMAGE_DPI = 300  # standard print quality
+
+
+def _a4_pixels(src_w: int, src_h: int, target_dpi: int = MAX_IMAGE_DPI) -> Tuple[int, int, int]:
+    """
+    Size an A4 page in pixels for an image of the given dimensions.
+
+    The DPI is the lowest at which the image fits A4 without downscaling,
+    clamped to [MIN_IMAGE_DPI, target_dpi], so small scans are not padded
+    out to a 300 DPI page and only oversized sources get resampled.
+
+    Returns:
+        (width, height, dpi) of the A4 page
+    """
+    dpi = math.ceil(max(src_w / A4_WIDTH_INCHES, src_h / A4_HEIGHT_INCHES))
+    dpi = min(target_dpi, max(MIN_IMAGE_DPI, dpi))
+    return round(A4_WIDTH_INCHES * dpi), round(A4_HEIGHT_INCHES * dpi), dpi
+
+
+def convert_image_to_pdf(image_data: BinaryIO, logger: logging.Logger) -> Optional[BytesIO]:
+    """Convert image to PDF with A4 sizing"""
+    try:
+        # Open image
+        image = Image.open(image_data)
+
+        # A4 size in pixels at the DPI this image actually needs
+        img_width, img_height = image.size
+        A4_WIDTH, A4_HEIGHT, dpi = _a4_pixels(img_width, img_height)
+
+        # Calculate aspect ratio
+        aspect_ratio = img_width / img_height
+
+        # Calculate new dimensions while maintaining aspect ratio
+        if aspect_ratio > 1:  # Landscape
+            new_width = min(A4_WIDTH, img_width)
+            new_height = int(new_width / aspect_ratio)
+            if new_height > A4_HEIGHT:
+                new_height = A4_HEIGHT
                 new_width = int(new_height * aspect_ratio)
-                if new_width > A4_WIDTH:
-                    new_width = A4_WIDTH
-                    new_height = int(new_width / aspect_ratio)
+        else:  # Portrait
+            new_height = min(A4_HEIGHT, img_height)
+            new_width = int(new_height * aspect_ratio)
+            if new_width > A4_WIDTH:
+                new_width = A4_WIDTH
+                new_height = int(new_width / aspect_ratio)
 
-            # Resize image with high-quality resampling
-            resized_image = image.resize(
+        # Let the JPEG decoder scale oversized photos down while decoding
+        if image.format == 'JPEG':
+            image.draft(image.mode, (new_width, new_height))
+
+        # Convert to RGB if necessary
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        # Resize image with high-quality resampling
+        if (new_width, new_height) != image.size:
+            image = image.resize(
                 (new_width, new_height), Image.Resampling.LANCZOS)
 
-            # Create a new white A4 background
-            a4_image = Image.new('RGB', (A4_WIDTH, A4_HEIGHT), (255, 255, 255))
+        # Save the resized image on its own page at the chosen DPI
+        image_pdf = BytesIO()
+        image.save(image_pdf, format='PDF', resolution=float(dpi))
+        image_pdf.seek(0)
+
+        # Center it on an A4 page by shifting its content and growing
+        # the media box, rather than pasting onto a full A4 raster
+        points_per_pixel = 72 / dpi
+        page_width = A4_WIDTH_INCHES * 72
+        page_height = A4_HEIGHT_INCHES * 72
+        x_offset = (page_width - new_width * points_per_pixel) / 2
+        y_offset = (page_height - new_height * points_per_pixel) / 2
+
+        writer = PdfWriter()
+        page = writer.add_page(PdfReader(image_pdf).pages[0])
+        page.add_transformation(
+            Transformation().translate(x_offset, y_offset))
+        page.mediabox = RectangleObject(
+            [0, 0, page_width, page_height])
+
+        pdf_data = BytesIO()
+        writer.write(pdf_data)
+        pdf_data.seek(0)
+
+        logger.info(
+            "Image converted to A4 PDF successfully (original size: %dx%d, new size: %dx%d)", img_width, img_height, new_width, new_height)
+        return pdf_data
+    except Exception as e:
+        logger.error("Error converting image to PDF: %s", e)
+        return None
 
-            # Calculate position to center the image
-            x_offset = (A4_WIDTH - new_width) // 2
-            y_offset = (A4_HEIGHT - new_height) // 2
 
-            # Paste the resized image onto the A4 background
-            a4_image.paste(resized_image, (x_offset, y_offset))
+def _has_form_fields(reader: PdfReader) -> bool:
+    """Check for filled-in form fields, skipping the field walk when there is no AcroForm"""
+    return reader.root_object.get("/AcroForm") is not None and bool(reader.get_fields())
 
-            # Save as PDF
-            pdf_data = BytesIO()
-            a4_image.save(pdf_data, format='PDF', resolution=300.0)
-            pdf_data.seek(0)
 
-            self.logger.info(
-                f"Image converted to A4 PDF successfully (original size: {img_width}x{img_height}, new size: {new_width}x{new_height})")
-            return pdf_data
-        except Exception as e:
-            self.logger.error(f"Error converting image to PDF: {str(e)}")
-            return None
+def merge_pdf_readers(pdf_files: List[PdfReader], logger: logging.Logger) -> Optional[BinaryIO]:
+    """
+    Merge already-parsed PDF files in order.
+
+    qpdf does the merge, producing linearized output with generated form
+    field appearances. Only when qpdf is not installed are form-free
+    documents spliced in-process with pypdf instead; that output is not
+    linearized.
 
-    def validate_pdf(self, pdf_data: BytesIO) -> Tuple[bool, str]:
-        """Validate if the file is a valid PDF"""
+    Args:
+        pdf_files (List[PdfReader]): List of parsed PDF files to merge
+        logger (logging.Logger): Logger to report progress to
+
+    Returns:
+        Optional[BinaryIO]: Merged PDF file or None if merge fails
+    """
+    if not pdf_files:
+        logger.error("No PDF files provided")
+        return None
+
+    logger.info("Starting to merge %d PDF files", len(pdf_files))
+
+    # Check each input on its own, so a file with a damaged document
+    # catalog or page tree is skipped instead of failing the whole merge
+    usable_files = []
+    for i, reader in enumerate(pdf_files, 1):
         try:
-            pdf_data.seek(0)
-            PdfReader(pdf_data)
-            return True, ""
+            len(reader.pages)
         except Exception as e:
-            return False, str(e)
+            logger.warning("Skipping invalid PDF %d: %s", i, e)
+            continue
+        usable_files.append(reader)
 
-    def download_and_convert_file(self, url: str) -> Optional[BytesIO]:
-        """Download file and convert to PDF if necessary"""
-        self.logger.info(f"Downloading file from URL: {url}")
+    if not usable_files:
+        logger.error("No valid PDFs to merge")
+        return None
+    pdf_files = usable_files
+
+    if shutil.which('qpdf'):
+        return _merge_with_qpdf(pdf_files, logger)
+
+    # Form fields only matter for the in-process fallback
+    has_form_fields = False
+    for i, reader in enumerate(pdf_files, 1):
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-
-            content_type = response.headers.get('content-type', '').lower()
-            file_data = BytesIO(response.content)
-
-            # Handle PDF files
-            if 'application/pdf' in content_type:
-                is_valid, error_msg = self.validate_pdf(file_data)
-                if is_valid:
-                    self.logger.info(
-                        "PDF file downloaded and validated successfully")
-                    return file_data
-                else:
-                    self.logger.warning(f"Invalid PDF file: {error_msg}")
-                    return None
+            has_form_fields = _has_form_fields(reader)
+        except Exception as e:
+            # A form pypdf cannot read is spliced as plain pages
+            logger.warning("Could not read form fields of PDF %d: %s", i, e)
+            continue
+        if has_form_fields:
+            break
+
+    if has_form_fields:
+        logger.error(
+            "qpdf is not installed and is required to merge form fields. Please install it using: sudo apt-get install qpdf")
+        return None
 
-            # Handle image files
-            elif any(img_type in content_type for img_type in ['image/jpeg', 'image/png', 'image/gif']):
-                self.logger.info(f"Converting image ({content_type}) to PDF")
-                pdf_data = self.convert_image_to_pdf(file_data)
-                if pdf_data:
-                    self.logger.info("Image converted to PDF successfully")
-                    return pdf_data
-                else:
-                    self.logger.warning("Failed to convert image to PDF")
-                    return None
+    logger.warning(
+        "qpdf is not installed, merging with pypdf; output will not be linearized")
+    return _merge_with_pypdf(pdf_files, logger)
 
-            else:
-                self.logger.warning(
-                    f"Unsupported content type: {content_type}")
-                return None
 
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Error downloading file: {str(e)}")
-            return None
-        except Exception as e:
-            self.logger.error(f"Error processing file: {str(e)}")
+def _merge_with_pypdf(pdf_files: List[PdfReader], logger: logging.Logger) -> Optional[BinaryIO]:
+    """
+    Merge form-free PDF files in-process with pypdf.
+
+    Args:
+        pdf_files (List[PdfReader]): List of parsed PDF files to merge
+        logger (logging.Logger): Logger to report progress to
+
+    Returns:
+        Optional[BinaryIO]: Merged PDF file or None if merge fails
+    """
+    try:
+        writer = PdfWriter()
+        merged_count = 0
+        for i, reader in enumerate(pdf_files, 1):
+            try:
+                # Plain page splicing: outlines are not carried over, as
+                # was already the case with the qpdf --pages merge.
+                # Resolve the page tree first so a broken file adds nothing
+                pages = list(reader.pages)
+                for page in pages:
+                    writer.add_page(page)
+                merged_count += 1
+                logger.debug("Added PDF %d to merger", i)
+            except Exception as e:
+                # Broken page trees surface as AttributeError, KeyError etc.,
+                # not only PdfReadError
+                logger.warning("Skipping invalid PDF %d: %s", i, e)
+                continue
+
+        if not merged_count:
+            logger.error("No valid PDFs to merge")
             return None
 
-    def merge_pdfs(self, pdf_files: List[BytesIO]) -> Optional[BytesIO]:
-        """
-        Merge multiple PDF files while preserving filled form field values using qpdf.
+        # Share fonts and images repeated across inputs, and drop objects
+        # no page refers to any more
+        writer.compress_identical_objects(
+            remove_identicals=True, remove_orphans=True)
 
-        Args:
-            pdf_files (List[BytesIO]): List of PDF files to merge
+        output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        writer.write(output)
+        output.seek(0)
+
+        logger.info("PDFs merged successfully")
+        return output
+
+    except Exception as e:
+        logger.error("Error during PDF merge: %s", e)
+        return None
+
+
+def _merge_with_qpdf(pdf_files: List[PdfReader], logger: logging.Logger) -> Optional[BinaryIO]:
+    """
+    Merge multiple PDF files while preserving filled form field values using qpdf.
+
+    The caller checks that qpdf is installed.
+
+    Args:
+        pdf_files (List[PdfReader]): List of parsed PDF files to merge
+        logger (logging.Logger): Logger to report progress to
+
+    Returns:
+        Optional[BinaryIO]: Merged PDF file or None if merge fails
+    """
+    try:
+        # Create temporary directory for PDF files
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Save all PDFs to temporary files
+            temp_files = []
+            for i, pdf_file in enumerate(pdf_files, 1):
+                # Inputs that are already files on disk are passed as-is
+                name = getattr(pdf_file.stream, 'name', None)
+                if isinstance(name, str) and os.path.isfile(name):
+                    temp_files.append(name)
+                    continue
+
+                try:
+                    # Reset the reader's underlying stream
+                    pdf_file.stream.seek(0)
+
+                    # Save to temporary file
+                    temp_path = os.path.join(temp_dir, f'input_{i}.pdf')
+                    with open(temp_path, 'wb') as f:
+                        shutil.copyfileobj(pdf_file.stream, f)
+                    temp_files.append(temp_path)
+
+                except Exception as e:
+                    logger.warning("Error saving PDF %d: %s", i, e)
+                    continue
+
+            if not temp_files:
+                logger.error("No valid PDFs to merge")
+                return None
+
+            # Create output file path
+            output_path = os.path.join(temp_dir, 'merged.pdf')
+
+            # Build qpdf command
+            cmd = [
+                'qpdf',
+                '--empty',
+                '--pages',
+                *temp_files,
+                '--',
+                output_path,
+                '--linearize',
+                '--generate-appearances'
+            ]
+
+            # Execute qpdf command
+            try:
+                logger.info(
+                    "Executing qpdf command: %s", ' '.join(cmd))
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+
+                # Copy the merged PDF out before the directory is removed
+                output = tempfile.SpooledTemporaryFile(
+                    max_size=SPOOL_MAX_SIZE)
+                with open(output_path, 'rb') as f:
+                    shutil.copyfileobj(f, output)
+                output.seek(0)
+
+                logger.info("PDFs merged successfully")
+                return output
+
+            except subprocess.CalledProcessError as e:
+                logger.error("qpdf command failed: %s", e.stderr)
+                return None
+            except Exception as e:
+                logger.error("Error processing merged PDF: %s", e)
+                return None
+
+    except Exception as e:
+        logger.error("Error during PDF merge: %s", e)
+        return None
+
+
+def _service_logger(is_prod: bool) -> logging.Logger:
+    """Logger for one environment; staging and production log to separate files"""
+    return setup_logger(f"pdf_service.{'prod' if is_prod else 'staging'}", is_prod)
+
+
+def _worker_logger(is_prod: bool) -> logging.Logger:
+    """Console-only logger for pool workers, which must not share the rotating log file"""
+    return setup_logger(
+        f"pdf_service.{'prod' if is_prod else 'staging'}.worker", is_prod, log_to_file=False)
+
+
+def _convert_image_file(path: str, is_prod: bool) -> Optional[str]:
+    """Process pool entry point: convert an image file to an A4 PDF next to it"""
+    with open(path, 'rb') as image_file:
+        pdf_data = convert_image_to_pdf(image_file, _worker_logger(is_prod))
+    if not pdf_data:
+        return None
+
+    pdf_path = f'{path}.pdf'
+    with open(pdf_path, 'wb') as f:
+        f.write(pdf_data.getbuffer())
+    return pdf_path
+
+
+def _merge_pdf_files(paths: List[str], is_prod: bool) -> Optional[bytes]:
+    """Process pool entry point: parse and merge PDF files in order"""
+    logger = _worker_logger(is_prod)
+
+    with ExitStack() as stack:
+        pdf_files = []
+        for i, path in enumerate(paths, 1):
+            try:
+                pdf_files.append(
+                    PdfReader(stack.enter_context(open(path, 'rb')), strict=False))
+            except Exception as e:
+                # Damaged headers and xref tables also raise ValueError,
+                # OSError, AttributeError etc., not only PdfReadError
+                logger.warning("Skipping invalid PDF %d: %s", i, e)
 
-        Returns:
-            Optional[BytesIO]: Merged PDF file or None if merge fails
-        """
         if not pdf_files:
-            self.logger.error("No PDF files provided")
+            logger.error("No valid PDFs to merge")
             return None
 
-        self.logger.info(f"Starting to merge {len(pdf_files)} PDF files")
+        merged_pdf = merge_pdf_readers(pdf_files, logger)
+        return merged_pdf.read() if merged_pdf else None
 
-        try:
-            import tempfile
-            import subprocess
-            import os
-            import shutil
 
-            # Check if qpdf is installed
-            if not shutil.which('qpdf'):
-                self.logger.error(
-                    "qpdf is not installed. Please install it using: sudo apt-get install qpdf")
-                return None
+def _new_cpu_pool() -> ProcessPoolExecutor:
+    # Workers come from a forkserver rather than forking the server
+    # process, which has event loop and client threads running
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("forkserver"))
 
-            # Create temporary directory for PDF files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save all PDFs to temporary files
-                temp_files = []
-                for i, pdf_file in enumerate(pdf_files, 1):
-                    try:
-                        # Reset file pointer
-                        pdf_file.seek(0)
-
-                        # Save to temporary file
-                        temp_path = os.path.join(temp_dir, f'input_{i}.pdf')
-                        with open(temp_path, 'wb') as f:
-                            f.write(pdf_file.read())
-                        temp_files.append(temp_path)
-
-                    except Exception as e:
-                        self.logger.warning(f"Error saving PDF {i}: {e}")
-                        continue
-
-                if not temp_files:
-                    self.logger.error("No valid PDFs to merge")
-                    return None
 
-                # Create output file path
-                output_path = os.path.join(temp_dir, 'merged.pdf')
-
-                # Build qpdf command
-                cmd = [
-                    'qpdf',
-                    '--empty',
-                    '--pages',
-                    *temp_files,
-                    '--',
-                    output_path,
-                    '--linearize',
-                    '--generate-appearances'
-                ]
-
-                # Execute qpdf command
-                try:
-                    self.logger.info(
-                        f"Executing qpdf command: {' '.join(cmd)}")
-                    result = subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
+# Image conversion and merging are CPU-bound; run them in worker processes
+# so they neither block the event loop nor contend for the GIL.
+# Worker processes are only started on first use.
+_CPU_POOL = _new_cpu_pool()
 
-                    # Read the merged PDF
-                    with open(output_path, 'rb') as f:
-                        output = BytesIO(f.read())
 
-                    self.logger.info("PDFs merged successfully")
-                    return output
+async def _run_in_cpu_pool(func, *args):
+    """
+    Run func(*args) in the process pool.
 
-                except subprocess.CalledProcessError as e:
-                    self.logger.error(f"qpdf command failed: {e.stderr}")
-                    return None
-                except Exception as e:
-                    self.logger.error(f"Error processing merged PDF: {e}")
-                    return None
+    A worker that dies (e.g. OOM-killed) leaves the pool permanently
+    broken, so the pool is replaced and the call retried once.
+    """
+    global _CPU_POOL
+    loop = asyncio.get_running_loop()
+    pool = _CPU_POOL
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # Concurrent callers see the same failure; only the first replaces it
+        if _CPU_POOL is pool:
+            _CPU_POOL = _new_cpu_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(_CPU_POOL, func, *args)
+
+
+class PDFService:
+    def __init__(self, is_prod: bool = False):
+        self.settings = get_settings()
+        self.is_prod = is_prod
+        self.logger = _service_logger(is_prod)
+
+        self.s3_client = get_s3_client()
+        self.merge_cache = MergeCache(
+            self.settings.MERGE_CACHE_MAX_BYTES, self.settings.MERGE_CACHE_TTL_SECONDS)
+        self.logger.info(
+            "Initialized PDFService for %s environment", 'production' if is_prod else 'staging')
+
+    def convert_image_to_pdf(self, image_data: BinaryIO) -> Optional[BytesIO]:
+        """Convert image to PDF with A4 sizing"""
+        return convert_image_to_pdf(image_data, self.logger)
+
+    def _classify_and_convert(self, kind: FileKind, content_type: str, file_data: BinaryIO) -> Optional[PdfReader]:
+        """Parse PDFs and convert images to PDF based on the file kind"""
+        # Handle PDF files; the reader built here doubles as validation
+        if kind == 'pdf':
+            try:
+                reader = PdfReader(file_data, strict=False)
+            except Exception as e:
+                self.logger.warning("Invalid PDF file: %s", e)
+                return None
+            self.logger.info(
+                "PDF file downloaded and validated successfully")
+            return reader
+
+        # Handle image files
+        elif kind == 'image':
+            self.logger.info("Converting image (%s) to PDF", content_type)
+            pdf_data = self.convert_image_to_pdf(file_data)
+            if pdf_data:
+                self.logger.info("Image converted to PDF successfully")
+                return PdfReader(pdf_data)
+            else:
+                self.logger.warning("Failed to convert image to PDF")
+                return None
 
+        else:
+            self.logger.warning(
+                "Unsupported content type: %s", content_type)
+            return None
+
+    def download_and_convert_file(self, url: str) -> Optional[PdfReader]:
+        """Download file and convert to PDF if necessary"""
+        self.logger.info("Downloading file from URL: %s", url)
+        try:
+            response = _SESSION.get(url, timeout=(5, 30), stream=True)
+            try:
+                response.raise_for_status()
+
+                content_type = response.headers.get(
+                    'content-type', '').lower()
+                kind = classify(url)
+                if kind == 'unknown':
+                    kind = classify_content_type(content_type)
+
+                # Stream the body to a spooled file instead of holding it in memory
+                file_data = tempfile.SpooledTemporaryFile(
+                    max_size=SPOOL_MAX_SIZE)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    file_data.write(chunk)
+                file_data.seek(0)
+
+                return self._classify_and_convert(kind, content_type, file_data)
+            finally:
+                response.close()
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error("Error downloading file: %s", e)
+            return None
         except Exception as e:
-            self.logger.error(f"Error during PDF merge: {e}")
+            self.logger.error("Error processing file: %s", e)
             return None
 
-    def upload_to_s3(self, file_data: BytesIO, bucket: str, key: str) -> Optional[str]:
+    def merge_pdfs(self, pdf_files: List[PdfReader]) -> Optional[BinaryIO]:
+        """Merge already-parsed PDF files in order"""
+        return merge_pdf_readers(pdf_files, self.logger)
+
+    def _upload_keys(self, key: str) -> List[str]:
+        """Keys a merged PDF is written to: the primary one, plus the alt key when double-writing"""
+        return [key, alt_key(key)] if self.settings.S3_DOUBLE_WRITE else [key]
+
+    def _upload_metadata(self) -> dict:
+        """S3 object metadata recording when the upload was made"""
+        return {'upload-timestamp': datetime.utcnow().isoformat()}
+
+    def upload_to_s3(self, file_data: BinaryIO, bucket: str, key: str) -> Optional[str]:
         """Upload file to S3 bucket with retries and error handling"""
         self.logger.info(
-            f"Uploading merged PDF to S3 bucket: {bucket}, key: {key}")
-
-        max_retries = 3
-        retry_delay = 2  # seconds
+            "Uploading merged PDF to S3 bucket: %s, key: %s", bucket, key)
 
-        for attempt in range(max_retries):
+        for attempt in range(UPLOAD_MAX_RETRIES):
             try:
                 # Ensure file pointer is at the beginning
                 file_data.seek(0)
 
-                # Get current timestamp for S3
-                timestamp = datetime.utcnow()
-
-                # Upload with retry configuration
-                self.s3_client.upload_fileobj(
-                    file_data,
-                    bucket,
-                    key,
-                    ExtraArgs={
-                        'ContentType': 'application/pdf',
-                        'ACL': 'private',
-                        'Metadata': {
-                            'upload-timestamp': timestamp.isoformat()
-                        }
-                    }
-                )
+                extra_args = {
+                    'ContentType': 'application/pdf',
+                    'ACL': 'private',
+                    'Metadata': self._upload_metadata()
+                }
+
+                target_keys = self._upload_keys(key)
+                if len(target_keys) > 1:
+                    # upload_fileobj consumes its stream, so give each PUT its own copy
+                    data = file_data.read()
+                    with ThreadPoolExecutor(max_workers=len(target_keys)) as executor:
+                        futures = [
+                            executor.submit(
+                                self.s3_client.upload_fileobj,
+                                BytesIO(data),
+                                bucket,
+                                target_key,
+                                ExtraArgs=extra_args,
+                                Config=UPLOAD_TRANSFER_CONFIG
+                            )
+                            for target_key in target_keys
+                        ]
+                        for future in futures:
+                            future.result()
+                else:
+                    # Upload with retry configuration
+                    self.s3_client.upload_fileobj(
+                        file_data,
+                        bucket,
+                        key,
+                        ExtraArgs=extra_args,
+                        Config=UPLOAD_TRANSFER_CONFIG
+                    )
 
                 self.logger.info("File uploaded successfully to S3")
                 return key
 
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code')
-                error_message = e.response.get('Error', {}).get('Message')
+            except Exception as e:
+                delay = _upload_retry_delay(e, attempt, self.logger)
+                if delay is None:
+                    return None
+                time.sleep(delay)
 
-                if error_code == 'RequestTimeTooSkewed':
-                    self.logger.warning(
-                        f"Time skew detected on attempt {attempt + 1}. Waiting before retry...")
-                    # Wait longer for time skew issues
-                    time.sleep(retry_delay * (attempt + 1) * 2)
-                    continue
+        return None
 
-                self.logger.error(
-                    f"S3 upload error (attempt {attempt + 1}/{max_retries}): {error_code} - {error_message}")
-                if attempt == max_retries - 1:
-                    return None
+    async def upload_to_s3_async(self, data: bytes, bucket: str, key: str) -> Optional[str]:
+        """Upload file to S3 bucket from the event loop with retries and error handling"""
+        self.logger.info(
+            "Uploading merged PDF to S3 bucket: %s, key: %s", bucket, key)
 
-            except Exception as e:
-                self.logger.error(
-                    f"Unexpected error during S3 upload (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt == max_retries - 1:
-                    return None
+        async with get_aio_session().client('s3', config=_s3_client_config()) as s3_client:
+            for attempt in range(UPLOAD_MAX_RETRIES):
+                try:
+                    metadata = self._upload_metadata()
+
+                    # A single PUT for the in-memory buffer; no multipart negotiation
+                    await asyncio.gather(*(
+                        s3_client.put_object(
+                            Bucket=bucket,
+                            Key=target_key,
+                            Body=data,
+                            ContentType='application/pdf',
+                            ACL='private',
+                            Metadata=metadata
+                        )
+                        for target_key in self._upload_keys(key)
+                    ))
+
+                    self.logger.info("File uploaded successfully to S3")
+                    return key
 
-            time.sleep(retry_delay * (attempt + 1))
+                except Exception as e:
+                    delay = _upload_retry_delay(e, attempt, self.logger)
+                    if delay is None:
+                        return None
+                    await asyncio.sleep(delay)
 
         return None
 
+    def _merged_pdf_location(self, lead_id: str, is_prod: bool) -> Tuple[str, str]:
+        """Pick the environment bucket and a fresh S3 key for a merged PDF"""
+        # Determine bucket
+        bucket = self.settings.PROD_BUCKET_NAME if is_prod else self.settings.STAGING_BUCKET_NAME
+
+        # Generate a unique S3 key: a nanosecond timestamp plus a random
+        # suffix, so concurrent requests for one lead never overwrite each other
+        s3_key = f"{lead_id}/merged_pdf/merged_document_{time.time_ns()}_{secrets.token_hex(3)}.pdf"
+
+        return bucket, s3_key
+
+    def _upload_merged(self, merged_pdf: BinaryIO, lead_id: str, is_prod: bool) -> str:
+        """Upload a merged PDF to the environment bucket and return its key"""
+        bucket, s3_key = self._merged_pdf_location(lead_id, is_prod)
+
+        # Upload to S3 with retries
+        result = self.upload_to_s3(merged_pdf, bucket, s3_key)
+        return self._check_merged_upload(result, lead_id)
+
+    async def _upload_merged_async(self, merged_bytes: bytes, lead_id: str, is_prod: bool) -> str:
+        """Upload merged PDF bytes to the environment bucket and return its key"""
+        bucket, s3_key = self._merged_pdf_location(lead_id, is_prod)
+
+        # Upload to S3 with retries
+        result = await self.upload_to_s3_async(merged_bytes, bucket, s3_key)
+        return self._check_merged_upload(result, lead_id)
+
+    def _check_merged_upload(self, result: Optional[str], lead_id: str) -> str:
+        """Raise if the merged upload failed, otherwise log success and return its key"""
+        if not result:
+            raise ValueError(
+                "Failed to upload to S3 after multiple attempts")
+
+        self.logger.info(
+            "Successfully processed merge request for lead_id: %s", lead_id)
+        return result
+
     def process_and_merge(self, urls: List[str], lead_id: str, is_prod: bool = False) -> Optional[str]:
-        """Process URLs, merge PDFs, and upload to S3"""
+        """
+        Process URLs, merge PDFs, and upload to S3.
+
+        The endpoints use process_and_merge_async. This synchronous pipeline
+        (with download_and_convert_file and upload_to_s3) is kept as the
+        library API for scripts and is not meant to gain new features.
+        """
         self.logger.info(
-            f"Processing merge request for lead_id: {lead_id} with {len(urls)} PDFs")
+            "Processing merge request for lead_id: %s with %d PDFs", lead_id, len(urls))
         try:
             # Download and convert all files
             pdf_files = []
@@ -331,22 +800,101 @@ class PDFService:
             if not merged_pdf:
                 raise ValueError("Failed to merge PDFs")
 
-            # Determine bucket
-            bucket = self.settings.PROD_BUCKET_NAME if is_prod else self.settings.STAGING_BUCKET_NAME
+            return self._upload_merged(merged_pdf, lead_id, is_prod)
+        except Exception as e:
+            self.logger.error("Error in process_and_merge: %s", e)
+            raise ValueError(f"Failed to process and merge PDFs: {str(e)}")
 
-            # Generate S3 key with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            s3_key = f"{lead_id}/merged_pdf/merged_document_{timestamp}.pdf"
+    async def _build_merged_bytes(self, urls: List[str]) -> Tuple[bytes, bool]:
+        """
+        Download all URLs concurrently, convert them and merge the result.
 
-            # Upload to S3 with retries
-            result = self.upload_to_s3(merged_pdf, bucket, s3_key)
-            if not result:
-                raise ValueError(
-                    "Failed to upload to S3 after multiple attempts")
+        Returns:
+            The merged PDF bytes, and whether every URL was downloaded and
+            processed without errors (partial merges must not be cached)
+        """
+        # Downloads and converted images live on disk until the merge is done
+        with tempfile.TemporaryDirectory() as temp_dir:
+            return await self._build_merged_in(urls, temp_dir)
+
+    async def _build_merged_in(self, urls: List[str], temp_dir: str) -> Tuple[bytes, bool]:
+        """Download, convert and merge the URLs using temp_dir for the files"""
+        results = await download_all(urls, temp_dir)
+        complete = True
+
+        async def convert(url: str, result) -> Optional[str]:
+            nonlocal complete
+            if isinstance(result, BaseException):
+                self.logger.error(
+                    "Error downloading file from URL %s: %s", url, result)
+                complete = False
+                return None
+            content_type, path = result
+
+            # Dispatch on the URL suffix; sniff the content type only
+            # when the suffix doesn't say what the file is
+            kind = classify(url)
+            if kind == 'unknown':
+                kind = classify_content_type(content_type)
+
+            # PDFs are parsed once, by the merge worker
+            if kind == 'pdf':
+                return path
+            elif kind == 'image':
+                self.logger.info(
+                    "Converting image (%s) to PDF", content_type)
+                try:
+                    pdf_path = await _run_in_cpu_pool(
+                        _convert_image_file, path, self.is_prod)
+                except Exception as e:
+                    # e.g. BrokenProcessPool on both attempts; a retry may succeed
+                    self.logger.error("Error processing file: %s", e)
+                    complete = False
+                    return None
+                if not pdf_path:
+                    self.logger.warning("Failed to convert image to PDF")
+                return pdf_path
+            else:
+                self.logger.warning(
+                    "Unsupported content type: %s", content_type)
+                return None
 
-            self.logger.info(
-                f"Successfully processed merge request for lead_id: {lead_id}")
-            return s3_key
+        converted = await asyncio.gather(
+            *(convert(url, result) for url, result in zip(urls, results)))
+        pdf_paths = [path for path in converted if path]
+
+        if not pdf_paths:
+            raise ValueError("No valid files could be processed")
+
+        # Merge PDFs
+        merged_bytes = await _run_in_cpu_pool(
+            _merge_pdf_files, pdf_paths, self.is_prod)
+        if not merged_bytes:
+            raise ValueError("Failed to merge PDFs")
+
+        return merged_bytes, complete
+
+    async def process_and_merge_async(self, urls: List[str], lead_id: str, is_prod: bool = False) -> Optional[str]:
+        """Download all URLs concurrently, merge PDFs, and upload to S3"""
+        self.logger.info(
+            "Processing merge request for lead_id: %s with %d PDFs", lead_id, len(urls))
+        try:
+            # Retries of the same lead usually resend the same files, so
+            # reuse the merged result and only repeat the upload. Only
+            # requests whose URLs are all validly presigned use the cache;
+            # anything else is downloaded so S3 checks access.
+            key = cache_key(lead_id, urls)
+            cacheable = all(presigned_url_valid(url) for url in urls)
+            merged_bytes = self.merge_cache.get(key) if cacheable else None
+            if merged_bytes is None:
+                merged_bytes, complete = await self._build_merged_bytes(urls)
+                if complete and cacheable:
+                    self.merge_cache.put(key, merged_bytes)
+            else:
+                self.logger.info(
+                    "Reusing cached merge for lead_id: %s", lead_id)
+
+            return await self._upload_merged_async(merged_bytes, lead_id, is_prod)
         except Exception as e:
-            self.logger.error(f"Error in process_and_merge: {str(e)}")
+            self.logger.error("Error in process_and_merge_async: %s", e)
             raise ValueError(f"Failed to process and merge PDFs: {str(e)}")
@@ -5,19 +5,28 @@ from ..config import get_settings
 settings = get_settings()
 
 
-def setup_logger(name: str, is_prod: bool = False) -> logging.Logger:
+def setup_logger(name: str, is_prod: bool = False, log_to_file: bool = True) -> logging.Logger:
     """
     Set up a logger with file and console handlers.
 
     Args:
         name: Name of the logger
         is_prod: Whether this is for production environment
+        log_to_file: Whether to add the file handler; worker processes pass
+            False because RotatingFileHandler is not safe across processes
 
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
+
+    # Already configured: adding handlers again would emit every record twice
+    if logger.handlers:
+        return logger
+
     logger.setLevel(settings.LOG_LEVEL)
+    # Records are fully handled here; don't also pass them to the root logger
+    logger.propagate = False
 
     # Create formatters
     file_formatter = logging.Formatter(
@@ -28,20 +37,19 @@ def setup_logger(name: str, is_prod: bool = False) -> logging.Logger:
     )
 
     # Set up file handler
-    log_file = settings.PROD_LOG_FILE if is_prod else settings.STAGING_LOG_FILE
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(file_formatter)
+    if log_to_file:
+        log_file = settings.PROD_LOG_FILE if is_prod else settings.STAGING_LOG_FILE
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10*1024*1024,  # 10MB
+            backupCount=5
+        )
+        file_handler.setFormatter(file_formatter)
+        logger.addHandler(file_handler)
 
     # Set up console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(console_formatter)
-
-    # Add handlers to logger
-    logger.addHandler(file_handler)
     logger.addHandler(console_handler)
 
     return logger
@@ -1,18 +1,19 @@
 from app.services.pdf_service import PDFService
 from io import BytesIO
-from PyPDF2 import PdfReader
+from pypdf import PdfReader
+from typing import Optional
 import requests
+import shutil
 
 
-def validate_pdf(pdf_data: BytesIO) -> bool:
-    """Validate if the data is a proper PDF"""
+def validate_pdf(pdf_data: BytesIO) -> Optional[PdfReader]:
+    """Validate if the data is a proper PDF, returning the parsed reader"""
     try:
         pdf_data.seek(0)
-        PdfReader(pdf_data)
-        return True
+        return PdfReader(pdf_data, strict=False)
     except Exception as e:
         print(f"PDF validation error: {str(e)}")
-        return False
+        return None
 
 
 def test_merge_pdfs():
@@ -44,13 +45,14 @@ def test_merge_pdfs():
                 # Create BytesIO object
                 pdf_data = BytesIO(response.content)
 
-                # Validate PDF
-                if not validate_pdf(pdf_data):
+                # Validate PDF; the reader is reused for the merge
+                reader = validate_pdf(pdf_data)
+                if reader is None:
                     print(
                         f"Warning: URL {i} might be corrupted or not a valid PDF")
                     continue
 
-                pdf_files.append(pdf_data)
+                pdf_files.append(reader)
                 print(f"Successfully downloaded and validated PDF {i}")
 
             except Exception as e:
@@ -70,11 +72,12 @@ def test_merge_pdfs():
         # Save the merged PDF locally for verification
         output_path = "merged_output.pdf"
         with open(output_path, "wb") as f:
-            f.write(merged_pdf.getvalue())
+            shutil.copyfileobj(merged_pdf, f)
+        merged_pdf.seek(0)
         print(f"Merged PDF saved as '{output_path}'")
 
         # Verify the merged PDF
-        if validate_pdf(merged_pdf):
+        if validate_pdf(merged_pdf) is not None:
             print("Final merged PDF validation successful!")
         else:
             print("Warning: Final merged PDF validation failed!")